@@ -3,10 +3,13 @@ from __future__ import annotations
 import os
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Optional
 
+import orjson
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 
 def _load_env() -> None:
@@ -14,8 +17,9 @@ def _load_env() -> None:
 
 
 def _safe_json(resp: requests.Response) -> Any:
+    # orjson direto dos bytes: sem decodificar o corpo para str antes do parse
     try:
-        return resp.json()
+        return orjson.loads(resp.content)
     except Exception:
         return None
 
@@ -67,6 +71,21 @@ class AsimovEnv:
     enabled: bool
 
 
+def _read_env() -> AsimovEnv:
+    _load_env()
+    api_base = (os.getenv("ASIMOV_API_BASE") or "").strip()
+    api_key = (os.getenv("ASIMOV_API_KEY") or "").strip()
+    dataset = (os.getenv("ASIMOV_DATASET") or "").strip()
+    dataset_model = (os.getenv("ASIMOV_DATASET_MODEL") or "openai/text-embedding-ada-002").strip()
+    enabled = _as_bool(os.getenv("ASIMOV_ENABLED"), default=False)
+    return AsimovEnv(api_base, api_key, dataset, dataset_model, enabled)
+
+
+@lru_cache(maxsize=None)
+def _shared_client(env: AsimovEnv) -> "AsimovClient":
+    return AsimovClient(env)
+
+
 class AsimovClient:
     """
     Compatível com ASIMOV_API_BASE em dois formatos:
@@ -100,6 +119,7 @@ class AsimovClient:
     """
 
     MAX_SNIPPETS_LIMIT = 30
+    POOL_MAXSIZE = 32
 
     def __init__(self, env: AsimovEnv) -> None:
         raw = (env.api_base or "").strip()
@@ -112,23 +132,35 @@ class AsimovClient:
         # Se base termina com /api, NÃO prefixa "api" nos paths; caso contrário prefixa.
         self._api_prefix = "" if self.base_url.endswith("/api") else "api"
 
+        # sessão persistente: reaproveita conexões TCP/TLS (keep-alive) entre requisições,
+        # com pool dimensionado para uploads concorrentes
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_MAXSIZE)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
         # caches
         self._dataset_uuid_cache: dict[str, str] = {}  # name -> uuid
         self._dataset_name_cache: dict[str, str] = {}  # uuid -> name
+        self._ensured_cache: dict[str, dict[str, Any]] = {}  # dataset -> ensure_dataset ok
 
     @classmethod
     def from_env(cls) -> "AsimovClient":
-        _load_env()
-        api_base = (os.getenv("ASIMOV_API_BASE") or "").strip()
-        api_key = (os.getenv("ASIMOV_API_KEY") or "").strip()
-        dataset = (os.getenv("ASIMOV_DATASET") or "").strip()
-        dataset_model = (os.getenv("ASIMOV_DATASET_MODEL") or "openai/text-embedding-ada-002").strip()
-        enabled = _as_bool(os.getenv("ASIMOV_ENABLED"), default=False)
-        return cls(AsimovEnv(api_base, api_key, dataset, dataset_model, enabled))
+        return cls(_read_env())
+
+    @classmethod
+    def shared_from_env(cls) -> "AsimovClient":
+        """Como from_env, mas reaproveita o client (sessão HTTP e caches de dataset) entre execuções com o mesmo env."""
+        return _shared_client(_read_env())
 
     def is_configured(self) -> bool:
         return bool(self.base_url and self.api_key)
 
+    @property
+    def session(self) -> requests.Session:
+        """Sessão HTTP do client (pool de conexões), para quem precisa falar com o mesmo host por fora dos métodos do client."""
+        return self._session
+
     # -------- headers --------
     def _headers_json(self) -> dict[str, str]:
         k = self.api_key
@@ -160,7 +192,7 @@ class AsimovClient:
         params: Any = None,
     ) -> dict[str, Any]:
         url = self._url(suffix)
-        resp = requests.request(
+        resp = self._session.request(
             method=method.upper(),
             url=url,
             headers=headers,
@@ -200,6 +232,16 @@ class AsimovClient:
         if not ds:
             return {"ok": False, "reason": "ASIMOV_DATASET_missing"}
 
+        # já garantido nesta instância: evita repetir o probe HTTP
+        if ds in self._ensured_cache:
+            return {**self._ensured_cache[ds], "created": False}
+
+        out = self._ensure_dataset(ds)
+        if out.get("ok"):
+            self._ensured_cache[ds] = out
+        return out
+
+    def _ensure_dataset(self, ds: str) -> dict[str, Any]:
         # UUID -> apenas valida
         if _is_uuid(ds):
             chk = self.check_dataset(ds)
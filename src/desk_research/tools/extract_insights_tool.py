@@ -1,46 +1,229 @@
 from __future__ import annotations
 
-import json
+import hashlib
 import os
+import random
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Type
+from typing import IO, Any, Type
 from datetime import datetime
+from functools import lru_cache
 
+import orjson
 from dotenv import load_dotenv
 from crewai import Agent, Task, LLM
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
 from desk_research.tools.asimov_client import AsimovClient
+from desk_research.utils.file_walk import iter_files
+from desk_research.utils.rate_limiter import TokenBucket
 
 MAX_ITEMS_PER_BATCH = 30
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+CHECKPOINT_FILE = "checkpoint.jsonl"
+JSON_SUFFIXES = frozenset({".json"})
+UPLOADED_SET_FILE = "uploaded.set"
+UPLOADED_KEYS_FILE = "uploaded_keys.set"
+PARSE_POOL_MIN_FILES = 32
+PARSE_POOL_WORKERS = 8
+META_SNIPPET_SUFFIX = "#meta"
 
 load_dotenv()
 
-def extract_interview_insights(text: str, file_name: str) -> dict[str, Any]:
+ASIMOV_CONCURRENCY = max(1, int(os.getenv("ASIMOV_CONCURRENCY") or 8))
+
+# Limitadores compartilhados por todas as chamadas do processo (0 = sem limite)
+LLM_RPM_LIMITER = TokenBucket(int(os.getenv("LLM_RPM") or 60))
+LLM_TPM_LIMITER = TokenBucket(int(os.getenv("LLM_TPM") or 0))
+ASIMOV_RPM_LIMITER = TokenBucket(int(os.getenv("ASIMOV_RPM") or 0))
+
+LLM_CACHE_DIR = Path(
+    os.getenv("LLM_CACHE_DIR") or Path.home() / ".cache" / "desk_research" / "llm"
+).expanduser()
+
+METADATA_PROMPT_CHARS = 2000
+RULES_ONLY_MAX_CHARS = 4000
+
+LLM_MAX_ATTEMPTS = 5
+LLM_RETRY_INITIAL_S = 1.0
+LLM_RETRY_MAX_S = 60.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+BRAND_VOCABULARY = [
+    "Antarctica", "Antártica", "Brahma", "Skol", "Stella Artois", "Budweiser", "Corona",
+    "Bohemia", "Spaten", "Michelob", "Beck's", "Becks", "Colorado", "Patagonia",
+    "Serramalte", "Quilmes", "Heineken", "Amstel", "Itaipava", "Petra", "Devassa",
+    "Eisenbahn", "Kaiser", "Schin",
+]
+_BRAND_RE = re.compile(
+    r"\b(" + "|".join(re.escape(b) for b in sorted(BRAND_VOCABULARY, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+_BRAND_CANONICAL = {b.lower(): b for b in BRAND_VOCABULARY}
+# Turnos de fala: "Nome: ..." ou "Nome Sobrenome: ..." (o texto limpo do ingestor vem numa linha só)
+_SPEAKER_TURN_RE = re.compile(r"(?:^|(?<=\s))([A-ZÀ-Ý][A-Za-zÀ-ÿ]+(?: [A-ZÀ-Ý][A-Za-zÀ-ÿ]+)?):\s")
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|\Z)", re.S)
+_INTERVIEW_DATE_RE = re.compile(r"\(([A-Z][a-z]+ \d{1,2}, \d{4}) - \d{1,2}:\d{2}\s*[ap]m\)")
+
+METADATA_EXPECTED_OUTPUT = "JSON válido com estrutura: {'dataEntrevista': 'YYYY-MM-DD'}"
+QUOTES_EXPECTED_OUTPUT = "JSON válido com estrutura: {'participantes': [{'nome': '...', 'idade': '...', 'regiao': '...', 'classeSocial': '...'}], 'citacoes': [{'citacao': '...', 'pergunta': '...', 'participante': '...', 'marcaMencionada': [...], 'insight': '...'}]}"
+
+QUOTA_NAO_INFORMADA = {
+    "nome": "Não informado",
+    "idade": "Não informado",
+    "regiao": "Não informado",
+    "classeSocial": "Não informado"
+}
+
+
+def _llm_cache_path(model: str, prompt: str) -> Path:
+    """Caminho da resposta em cache, chaveado por sha256 de (modelo, prompt)."""
+    digest = hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+    return LLM_CACHE_DIR / f"{digest}.txt"
+
+
+def _retryable_status(exc: BaseException) -> tuple[int | None, float | None]:
     """
-    Extrai pontos importantes de uma entrevista usando um agente do CrewAI com LLM.
-    TUDO deve ser baseado em citações literais da entrevista.
-    As informações demográficas (quota) são extraídas pela LLM diretamente do texto.
+    Procura na cadeia de exceções um status HTTP retentável (429/5xx) e o Retry-After, se houver.
+    Funciona tanto com exceções do litellm quanto do SDK da OpenAI (ambas expõem status_code/response).
     """
+    current: BaseException | None = exc
+    seen: set[int] = set()
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        response = getattr(current, "response", None)
+        status = getattr(current, "status_code", None) or getattr(response, "status_code", None)
+        if status in RETRYABLE_STATUS:
+            retry_after = None
+            try:
+                retry_after = float((getattr(response, "headers", None) or {}).get("retry-after"))
+            except (TypeError, ValueError):
+                pass
+            return status, retry_after
+        current = current.__cause__ or current.__context__
+    return None, None
+
+
+def _acquire_llm_quota(prompt: str) -> None:
+    """Aguarda cota de RPM e de TPM (estimativa de ~4 caracteres por token) antes de chamar a LLM."""
+    LLM_RPM_LIMITER.acquire()
+    LLM_TPM_LIMITER.acquire(len(prompt) // 4)
+
+
+def _execute_with_retry(agent: Agent, task: Task) -> str:
+    """Executa a task com backoff exponencial com jitter, apenas para 429/5xx."""
+    for attempt in range(1, LLM_MAX_ATTEMPTS):
+        _acquire_llm_quota(task.description)
+        try:
+            return str(agent.execute_task(task))
+        except Exception as e:
+            status, retry_after = _retryable_status(e)
+            if status is None:
+                raise
+            backoff = min(LLM_RETRY_MAX_S, LLM_RETRY_INITIAL_S * 2 ** (attempt - 1))
+            time.sleep(min(LLM_RETRY_MAX_S, retry_after or backoff / 2 + random.uniform(0, backoff)))
+    _acquire_llm_quota(task.description)
+    return str(agent.execute_task(task))
+
 
+@lru_cache(maxsize=None)
+def _get_agent(model: str) -> Agent:
+    """Cria uma única vez, por modelo, o LLM e o agente de entrevistas (reaproveitando o cliente HTTP)."""
     llm = LLM(
-        model=os.getenv("MODEL"),
+        model=model,
         temperature=0.8,
         base_url=os.getenv("OPENAI_API_BASE"),
         api_key=os.getenv("OPENAI_API_KEY"),
     )
     
-    agent = Agent(
+    return Agent(
         role="Analista Qualitativo de Entrevistas",
         goal="Extrair insights baseados exclusivamente em citações literais de entrevistas, identificando perguntas, informações demográficas, marcas mencionadas, data da entrevista e insights.",
         backstory="Você é um especialista em análise qualitativa de entrevistas. Você extrai insights BASEADOS EXCLUSIVAMENTE em citações literais. Identifica todas as marcas mencionadas. Para cada citação do entrevistado, identifica a pergunta do entrevistador que a precedeu. Extrai informações demográficas e a data da entrevista diretamente do texto ou nome do arquivo. A data geralmente aparece no formato '(May 21, 2025 - 9:20pm)' e deve ser convertida para 'YYYY-MM-DD'.",
         llm=llm,
         verbose=False,
     )
+
+
+def _call_llm(model: str, prompt: str, expected_output: str) -> str:
+    """
+    Executa o prompt com o agente de entrevistas e devolve o texto bruto da resposta.
+    Respostas ficam em cache em disco, então reexecuções com o mesmo prompt não chamam a LLM.
+    """
+    cache_fp = _llm_cache_path(model, prompt)
+    if cache_fp.exists():
+        return cache_fp.read_text(encoding="utf-8")
+
+    agent = _get_agent(model)
+    task = Task(description=prompt, agent=agent, expected_output=expected_output)
+    result_text = _execute_with_retry(agent, task)
+
+    cache_fp.parent.mkdir(parents=True, exist_ok=True)
+    tmp_fp = cache_fp.with_suffix(".tmp")
+    tmp_fp.write_text(result_text, encoding="utf-8")
+    os.replace(tmp_fp, cache_fp)
+    return result_text
+
+
+def _call_llm_json(
+    model: str,
+    prompt: str,
+    expected_output: str,
+    items_key: str | None = None,
+) -> dict[str, Any]:
+    """
+    Chama a LLM e faz o parse do JSON da resposta, removendo cercas de markdown.
+    Com items_key, exige também que essa chave (quando presente) seja uma lista de objetos.
+    Resposta fora do formato sai do cache e levanta ValueError.
+    """
+    result_text = _call_llm(model, prompt, expected_output)
     
-    task = Task(
-        description=f"""Analise a seguinte entrevista e extraia pontos importantes BASEADOS EXCLUSIVAMENTE EM CITAÇÕES LITERAIS.
+    fence = _FENCE_RE.search(result_text) if "```" in result_text else None
+    result_text = (fence.group(1) if fence else result_text).strip()
+    
+    try:
+        parsed = orjson.loads(result_text)
+        if not isinstance(parsed, dict):
+            raise ValueError(f"expected a JSON object, got {type(parsed).__name__}")
+        items = parsed.get(items_key, []) if items_key else []
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise ValueError(f"expected '{items_key}' to be a list of objects")
+        return parsed
+    except ValueError:
+        # Resposta inválida não deve ficar presa no cache (JSONDecodeError é um ValueError)
+        _llm_cache_path(model, prompt).unlink(missing_ok=True)
+        raise
+
+
+def _metadata_prompt(text: str, file_name: str) -> str:
+    """
+    Prompt do passo barato, usado só quando o timestamp não é reconhecido: a data da entrevista,
+    a partir do início do texto e do nome do arquivo. As apresentações dos participantes podem
+    vir bem depois do início, por isso os dados demográficos são extraídos junto com as citações.
+    """
+    prompt = f"""Extraia a data da entrevista abaixo.
+
+INÍCIO DO TEXTO DA ENTREVISTA:
+{text[:METADATA_PROMPT_CHARS]}
+
+NOME DO ARQUIVO:
+{file_name}
+
+INSTRUÇÕES:
+1. EXTRAIA a data da entrevista. A data geralmente está no formato "(May 21, 2025 - 9:20pm)" ou similar. Converta para formato "YYYY-MM-DD" (ex: "2025-05-21"). Se não houver data, use "Não informado"
+2. NÃO invente informações que não estejam no texto ou no nome do arquivo
+
+Retorne APENAS um JSON válido no formato {{"dataEntrevista": "..."}}, sem markdown, sem explicações adicionais."""
+    return prompt
+
+
+def _quotes_prompt(text: str, file_name: str) -> str:
+    """Prompt do passo principal: participantes, citações literais, perguntas, marcas e insights a partir do texto completo."""
+    prompt = f"""Analise a seguinte entrevista e extraia pontos importantes BASEADOS EXCLUSIVAMENTE EM CITAÇÕES LITERAIS.
 
 TEXTO DA ENTREVISTA:
 {text}
@@ -52,20 +235,20 @@ INSTRUÇÕES CRÍTICAS:
 1. TODOS os insights devem ser baseados em citações literais do texto
 2. NÃO invente ou interprete além do que está nas citações
 3. Para cada citação do entrevistado, inclua a PERGUNTA do entrevistador que a precedeu
-4. EXTRAIA informações demográficas (quota) diretamente do texto da entrevista ou do nome do arquivo
-5. EXTRAIA a data da entrevista do texto. A data geralmente está no formato "(May 21, 2025 - 9:20pm)" ou similar. Procure por timestamps, menções de data no início da entrevista ou contexto temporal. Converta para formato "YYYY-MM-DD" (ex: "2025-05-21")
 
 Extraia e estruture em JSON:
 
+**participantes**: Lista dos entrevistados (não o entrevistador), cada um contendo:
+- "nome": Nome do entrevistado
+- "idade": Idade (formato: "XX anos" ou "Não informado")
+- "regiao": Região/Estado (sigla: RJ, SP, etc. ou "Não informado")
+- "classeSocial": Classe social (A1, B1, etc. ou "Não informado")
+- NÃO invente informações que não estejam no texto ou no nome do arquivo
+
 **citacoes**: Lista de objetos, cada um contendo:
 - "citacao": Citação literal EXATA do entrevistado
 - "pergunta": Pergunta do entrevistador que gerou essa resposta
-- "dataEntrevista": Data da entrevista extraída do texto (formato: "YYYY-MM-DD"). Deve ser a mesma para todas as citações
-- "quota": Objeto com informações demográficas EXTRAÍDAS DO TEXTO:
-  - "nome": Nome do entrevistado
-  - "idade": Idade (formato: "XX anos" ou "Não informado")
-  - "regiao": Região/Estado (sigla: RJ, SP, etc. ou "Não informado")
-  - "classeSocial": Classe social (A1, B1, etc. ou "Não informado")
+- "participante": Nome do entrevistado que disse a citação (ou "Não informado")
 - "marcaMencionada": Lista de marcas mencionadas na citação (ex: ["Antártica", "Brahma"])
 - "insight": Breve interpretação do que a citação revela (máximo 2 frases)
 
@@ -149,35 +332,95 @@ MEMÓRIAS E EXPERIÊNCIAS:
 
 - Mínimo de 15 citações
 
-Retorne APENAS um JSON válido, sem markdown, sem explicações adicionais.""",
-        agent=agent,
-        expected_output="JSON válido com estrutura: {'citacoes': [{'citacao': '...', 'pergunta': '...', 'dataEntrevista': 'YYYY-MM-DD', 'quota': {...}, 'marcaMencionada': [...], 'insight': '...'}]}"
-    )
+Retorne APENAS um JSON válido, sem markdown, sem explicações adicionais."""
+    return prompt
+
+
+def _quota_for(participante: str | None, participantes: list[dict[str, Any]]) -> dict[str, Any]:
+    """Associa a citação à quota do participante pelo nome; com um único participante, usa o dele."""
+    nome = str(participante or "").strip().lower()
+    for p in participantes:
+        if nome and str(p.get("nome") or "").strip().lower() == nome:
+            return {**QUOTA_NAO_INFORMADA, **p}
+    if len(participantes) == 1:
+        return {**QUOTA_NAO_INFORMADA, **participantes[0]}
+    return {**QUOTA_NAO_INFORMADA, "nome": participante or "Não informado"}
+
+
+def _parse_interview_date(text: str) -> str | None:
+    """Data da entrevista (YYYY-MM-DD) a partir do timestamp "(May 21, 2025 - 9:20pm)"; None se não houver."""
+    date_match = _INTERVIEW_DATE_RE.search(text)
+    if not date_match:
+        return None
+    try:
+        return datetime.strptime(date_match.group(1), "%B %d, %Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _rules_extract(text: str) -> dict[str, Any]:
+    """
+    Extrator determinístico para transcrições curtas, sem LLM.
+    O primeiro falante é tratado como moderador: suas falas viram "pergunta" e cada fala
+    seguinte de outro participante vira uma citação, com marcas do vocabulário conhecido.
+    """
+    data_entrevista = _parse_interview_date(text) or "Não informado"
+    
+    turns = list(_SPEAKER_TURN_RE.finditer(text))
+    moderador = turns[0].group(1) if turns else None
+    pergunta = "Não identificada"
+    citacoes: list[dict[str, Any]] = []
+    
+    for i, turn in enumerate(turns):
+        end = turns[i + 1].start() if i + 1 < len(turns) else len(text)
+        fala = text[turn.end():end].strip()
+        if not fala:
+            continue
+        if turn.group(1) == moderador:
+            pergunta = fala
+            continue
+        if len(fala.split()) < 3:
+            continue
+        marcas = list(dict.fromkeys(_BRAND_CANONICAL[m.lower()] for m in _BRAND_RE.findall(fala)))
+        citacoes.append({
+            "citacao": fala,
+            "pergunta": pergunta,
+            "dataEntrevista": data_entrevista,
+            "quota": {**QUOTA_NAO_INFORMADA, "nome": turn.group(1)},
+            "marcaMencionada": marcas,
+            "insight": "",
+        })
+    
+    return {"citacoes": citacoes}
+
+
+def extract_interview_insights(text: str, file_name: str) -> dict[str, Any]:
+    """
+    Extrai pontos importantes de uma entrevista usando um agente do CrewAI com LLM.
+    TUDO deve ser baseado em citações literais da entrevista.
+    A data vem do timestamp da transcrição; só quando ele não é reconhecido um modelo menor
+    (MODEL_SMALL) é chamado para extraí-la. As informações demográficas (quota) vêm junto com
+    as citações e são associadas a cada uma pelo participante.
+    """
+    model = os.getenv("MODEL") or ""
+    model_small = os.getenv("MODEL_SMALL") or model
     
     try:
-        result = agent.execute_task(task)
-        
-        result_text = str(result)
+        data_entrevista = _parse_interview_date(text)
+        if data_entrevista is None:
+            metadata = _call_llm_json(model_small, _metadata_prompt(text, file_name), METADATA_EXPECTED_OUTPUT)
+            data_entrevista = metadata.get("dataEntrevista") or "Não informado"
+        insights = _call_llm_json(model, _quotes_prompt(text, file_name), QUOTES_EXPECTED_OUTPUT, items_key="citacoes")
         
-        if "```json" in result_text:
-            result_text = result_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in result_text:
-            result_text = result_text.split("```")[1].split("```")[0].strip()
-        
-        insights = json.loads(result_text)
+        participantes = insights.pop("participantes", None)
+        if not isinstance(participantes, list):
+            participantes = []
+        participantes = [p for p in participantes if isinstance(p, dict)]
         
         if "citacoes" in insights:
             for citacao_item in insights["citacoes"]:
-                if "dataEntrevista" not in citacao_item:
-                    citacao_item["dataEntrevista"] = "Não informado"
-                
-                if "quota" not in citacao_item:
-                    citacao_item["quota"] = {
-                        "nome": "Não informado",
-                        "idade": "Não informado",
-                        "regiao": "Não informado",
-                        "classeSocial": "Não informado"
-                    }
+                citacao_item["dataEntrevista"] = data_entrevista
+                citacao_item["quota"] = _quota_for(citacao_item.pop("participante", None), participantes)
                 
                 if "marcaMencionada" not in citacao_item:
                     citacao_item["marcaMencionada"] = []
@@ -189,12 +432,17 @@ Retorne APENAS um JSON válido, sem markdown, sem explicações adicionais.""",
         
         return insights
         
-    except Exception as e:
+    except ValueError as e:
+        # Resposta da LLM fora do formato esperado (já removida do cache); erros de rede/API sobem para o chamador
         return {
             "error": str(e),
             "citacoes": [],
         }
 
+def _content_digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
 def _format_insights_for_asimov(
     insights: dict[str, Any], 
     file_uuid: str,
@@ -206,8 +454,6 @@ def _format_insights_for_asimov(
 
     data_extracao = datetime.now().strftime("%Y-%m-%d")
     
-    total_chunks = 1 + len(citacoes)
-    
     # CHUNK 1: METADADOS
     metadata_chunk = {
         "uuid": file_uuid,
@@ -216,30 +462,194 @@ def _format_insights_for_asimov(
         "data_extracao": data_extracao
     }
     
+    # Um único snippet de metadados por arquivo: a chave não depende do conteúdo, que muda a cada extração
     snippets.append({
-        "key": f"{file_uuid}#chunk_01of{total_chunks:02d}",
-        "content": json.dumps(metadata_chunk, ensure_ascii=False, indent=2)
+        "key": f"{file_uuid}{META_SNIPPET_SUFFIX}",
+        "content": orjson.dumps(metadata_chunk, option=JSON_OPTIONS).decode("utf-8")
     })
     
-    # CHUNKS 2+: CITAÇÕES
-    for idx, item in enumerate(citacoes, 1):
+    # CHUNKS 2+: CITAÇÕES (chave definida pelo conteúdo serializado do snippet, não pela posição)
+    seen: Counter[bytes] = Counter()
+    for item in citacoes:
+        content = orjson.dumps({
+            "citacao": item.get("citacao", ""),
+            "pergunta": item.get("pergunta", "Não identificada"),
+            "quota": item.get("quota", {}),
+            "marcaMencionada": item.get("marcaMencionada", []),
+            "dataEntrevista": item.get("dataEntrevista"),
+            "key": file_uuid,
+            "insight": item.get("insight", "")
+        }, option=JSON_OPTIONS)
+        # Citações repetidas no mesmo arquivo ganham a ocorrência na chave para não colidirem
+        occurrence = seen[content]
+        seen[content] += 1
+        digest = _content_digest(content if not occurrence else content + f"\n{occurrence}".encode())
         
         snippets.append({
-            "key": f"{file_uuid}#chunk_{idx + 1:02d}of{total_chunks:02d}",
-            "content": json.dumps({
-                "citacao": item.get("citacao", ""),
-                "pergunta": item.get("pergunta", "Não identificada"),
-                "quota": item.get("quota", {}),
-                "marcaMencionada": item.get("marcaMencionada", []),
-                "dataEntrevista": item.get("dataEntrevista"),
-                "key": file_uuid,
-                "insight": item.get("insight", "")
-            }, ensure_ascii=False, indent=2)
+            "key": f"{file_uuid}#{digest}",
+            "content": content.decode("utf-8"),
         })
     
     return snippets
 
 
+def _write_output_json(fp: Path, data: dict[str, Any]) -> None:
+    """
+    Grava o JSON de saída num arquivo temporário e o move atomicamente para o destino,
+    para que uma interrupção nunca deixe um JSON truncado no lugar do arquivo.
+    """
+    tmp_fp = fp.with_suffix(".tmp")
+    with tmp_fp.open("wb") as f:
+        f.write(orjson.dumps(data, option=JSON_OPTIONS))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_fp, fp)
+
+
+def _load_checkpoint(fp: Path) -> set[tuple[str, str]]:
+    """Carrega os pares (uuid, sha256) já extraídos com sucesso do checkpoint JSONL."""
+    done: set[tuple[str, str]] = set()
+    if not fp.exists():
+        return done
+    for line in fp.read_text(encoding="utf-8").splitlines():
+        try:
+            entry = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            # linha truncada por uma interrupção no meio da escrita
+            continue
+        if entry.get("status") == "ok":
+            done.add((entry.get("uuid"), entry.get("sha256")))
+    return done
+
+
+def _load_previous_output(fp: Path, file_uuid: str | None) -> dict[str, Any] | None:
+    """
+    Saída gerada antes do checkpoint existir: se o arquivo já tem insights extraídos para o
+    mesmo uuid, ele é reaproveitado como está (inclusive o status de upload no Asimov).
+    """
+    if not fp.exists():
+        return None
+    try:
+        data = orjson.loads(fp.read_bytes())
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or data.get("uuid") != file_uuid:
+        return None
+    insights = data.get("extracted_insights")
+    if not isinstance(insights, dict) or "citacoes" not in insights or "error" in insights:
+        return None
+    return data
+
+
+def _append_checkpoint(checkpoint: IO[str], entry: dict[str, Any]) -> None:
+    """Registra uma extração concluída e força a gravação em disco."""
+    checkpoint.write(orjson.dumps(entry).decode("utf-8") + "\n")
+    checkpoint.flush()
+    os.fsync(checkpoint.fileno())
+
+
+def _upload_key(file_uuid: str | None, text_sha256: str) -> str:
+    """Entrada do uploaded.set: muda quando o texto muda, então uma reextração nunca herda o "já enviado"."""
+    return f"{file_uuid}:{text_sha256}"
+
+
+def _load_uploaded_set(fp: Path) -> set[str]:
+    """Carrega um sidecar de valores (um por linha) já enviados ao Asimov: (uuid, sha256) de arquivos ou chaves de snippets."""
+    if not fp.exists():
+        return set()
+    return {line.strip() for line in fp.read_text(encoding="utf-8").splitlines() if line.strip()}
+
+
+def _mark_uploaded(fp: Path, *values: str) -> None:
+    if not values:
+        return
+    with fp.open("a", encoding="utf-8") as f:
+        f.writelines(f"{v}\n" for v in values)
+
+
+def _unmark_uploaded(fp: Path, *values: str) -> None:
+    """Remove valores do sidecar (upload refeito sem sucesso completo), regravando-o atomicamente."""
+    drop = set(values)
+    current = _load_uploaded_set(fp)
+    if not drop & current:
+        return
+    tmp_fp = fp.with_suffix(".tmp")
+    tmp_fp.write_text("".join(f"{v}\n" for v in sorted(current - drop)), encoding="utf-8")
+    os.replace(tmp_fp, fp)
+
+
+def _upload_snippet_batches(
+    asimov: AsimovClient,
+    dataset_name: str,
+    tagged_snippets: list[tuple[str, dict[str, str]]],
+) -> dict[str, dict[str, Any]]:
+    """
+    Envia snippets de vários arquivos em lotes de MAX_ITEMS_PER_BATCH, sem separar por arquivo,
+    e redistribui o resultado: para cada arquivo, quantos snippets foram enviados e os erros
+    dos lotes que continham snippets dele. Até ASIMOV_CONCURRENCY lotes são enviados em paralelo.
+    """
+    results: dict[str, dict[str, Any]] = {
+        owner: {"uploaded": 0, "errors": [], "keys": []} for owner, _ in tagged_snippets
+    }
+    batches = [
+        tagged_snippets[batch_start:batch_start + MAX_ITEMS_PER_BATCH]
+        for batch_start in range(0, len(tagged_snippets), MAX_ITEMS_PER_BATCH)
+    ]
+    
+    def _upload(batch: list[tuple[str, dict[str, str]]]) -> dict[str, Any]:
+        ASIMOV_RPM_LIMITER.acquire()
+        try:
+            return asimov.upload_snippets([snippet for _, snippet in batch], dataset=dataset_name)
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+    
+    with ThreadPoolExecutor(max_workers=ASIMOV_CONCURRENCY) as executor:
+        batch_results = list(executor.map(_upload, batches))
+    
+    for batch_number, (batch, result) in enumerate(zip(batches, batch_results), 1):
+        if result.get("ok"):
+            for owner, snippet in batch:
+                results[owner]["keys"].append(snippet["key"])
+        for owner, count in Counter(owner for owner, _ in batch).items():
+            if result.get("ok"):
+                results[owner]["uploaded"] += count
+            else:
+                results[owner]["errors"].append({
+                    "batch": batch_number,
+                    "error": result.get("reason") or result.get("error")
+                })
+    
+    return results
+
+
+def _fingerprint_ingested(json_file: Path) -> tuple[str | None, str | None, str | None]:
+    """
+    Lê um JSON do ingestor e calcula o sha256 do texto. Retorna (uuid, sha256, erro);
+    sha256 é None quando o texto está vazio. O texto em si não é devolvido.
+    """
+    try:
+        data = orjson.loads(json_file.read_bytes())
+        text = data.get("text") or ""
+        return data.get("uuid"), hashlib.sha256(text.encode("utf-8")).hexdigest() if text else None, None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def _fingerprint_ingested_files(
+    json_files: list[Path],
+) -> list[tuple[str | None, str | None, str | None]]:
+    """
+    Leitura + parse + hash dos JSONs do ingestor. Em diretórios grandes a leitura (dominada
+    por I/O) é feita em threads; processos exigiriam fork dentro do processo multithread do CrewAI.
+    Só (uuid, sha256, erro) é guardado: o texto é relido sob demanda, arquivo a arquivo,
+    apenas para os arquivos que ainda precisam de extração.
+    """
+    if len(json_files) < PARSE_POOL_MIN_FILES:
+        return [_fingerprint_ingested(fp) for fp in json_files]
+    with ThreadPoolExecutor(max_workers=PARSE_POOL_WORKERS) as executor:
+        return list(executor.map(_fingerprint_ingested, json_files))
+
+
 class ExtractInsightsArgs(BaseModel):
     ingestor_output_dir: str = Field(..., description="Diretório contendo JSONs gerados pelo ingestor.")
     extractor_output_dir: str = Field(..., description="Diretório para salvar JSONs com insights extraídos.")
@@ -270,57 +680,88 @@ class ExtractInsightsTool(BaseTool):
         
         warnings: list[str] = []
         outputs: list[str] = []
+        # (arquivo de saída, dados em memória, chave no uploaded.set);
+        # dados None = retomado do checkpoint, lido do disco sob demanda
+        processed: list[tuple[Path, dict[str, Any] | None, str]] = []
         processed_count = 0
         
-        json_files = sorted([p for p in ingestor_path.rglob("*.json") if p.is_file()])
-        asimov = AsimovClient.from_env()
+        json_files = sorted(iter_files(ingestor_path, JSON_SUFFIXES))
+        asimov = AsimovClient.shared_from_env()
         dataset_name = asimov.dataset or (os.getenv("ASIMOV_DATASET") or "").strip() or None
         
         # EXTRAIR INSIGHTS
-        for json_file in json_files:
-            try:
-                data = json.loads(json_file.read_text(encoding="utf-8"))
-                text = data.get("text", "")
-                file_name = data.get("file_name", "")
-                
-                if not text:
-                    warnings.append(f"empty_text:{json_file.name}")
-                    continue
-                
-                # Verificar se já foi processado
-                output_file = extractor_path / json_file.name
-                if output_file.exists():
-                    try:
-                        existing_data = json.loads(output_file.read_text(encoding="utf-8"))
-                        if "extracted_insights" in existing_data:
-                            outputs.append(str(output_file))
-                            processed_count += 1
-                            continue
-                    except:
-                        pass
-                
-                insights = extract_interview_insights(text, file_name)
-                
-                if "error" in insights:
-                    warnings.append(f"llm_error:{json_file.name}:{insights['error']}")
+        checkpoint_fp = extractor_path / CHECKPOINT_FILE
+        checkpointed = _load_checkpoint(checkpoint_fp)
+        checkpointed_uuids = {file_uuid for file_uuid, _ in checkpointed}
+
+        fingerprints = _fingerprint_ingested_files(json_files)
+
+        with checkpoint_fp.open("a", encoding="utf-8") as checkpoint:
+            for json_file, (file_uuid, text_sha256, load_error) in zip(json_files, fingerprints):
+                if load_error:
+                    warnings.append(f"failed:{json_file.name}:{load_error}")
                     continue
-                
-                new_data = {
-                    "uuid": data.get("uuid"),
-                    "file_name": data.get("file_name"),
-                    "extracted_insights": insights
-                }
-
-                # Salvar JSON
-                output_file.write_text(
-                    json.dumps(new_data, ensure_ascii=False, indent=2),
-                    encoding="utf-8"
-                )
-                outputs.append(str(output_file))
-                processed_count += 1
-                
-            except Exception as e:
-                warnings.append(f"failed:{json_file.name}:{e}")
+                try:
+                    if text_sha256 is None:
+                        warnings.append(f"empty_text:{json_file.name}")
+                        continue
+                    
+                    # Verificar se já foi processado
+                    output_file = extractor_path / json_file.name
+                    if (file_uuid, text_sha256) in checkpointed and output_file.exists():
+                        outputs.append(str(output_file))
+                        processed.append((output_file, None, _upload_key(file_uuid, text_sha256)))
+                        processed_count += 1
+                        continue
+                    
+                    # Saída de uma execução anterior ao checkpoint: registra no checkpoint em vez de extrair de novo
+                    previous = None
+                    if file_uuid not in checkpointed_uuids:
+                        previous = _load_previous_output(output_file, file_uuid)
+                    if previous is not None:
+                        _append_checkpoint(checkpoint, {
+                            "uuid": file_uuid,
+                            "sha256": text_sha256,
+                            "status": "ok",
+                        })
+                        outputs.append(str(output_file))
+                        processed.append((output_file, previous, _upload_key(file_uuid, text_sha256)))
+                        processed_count += 1
+                        continue
+                    
+                    data = orjson.loads(json_file.read_bytes())
+                    text = data.get("text") or ""
+                    file_name = data.get("file_name", "")
+                    
+                    # Transcrições curtas não compensam a latência da LLM
+                    if len(text) < RULES_ONLY_MAX_CHARS:
+                        insights = _rules_extract(text)
+                    else:
+                        insights = extract_interview_insights(text, file_name)
+                    
+                    if "error" in insights:
+                        warnings.append(f"llm_error:{json_file.name}:{insights['error']}")
+                        continue
+                    
+                    new_data = {
+                        "uuid": data.get("uuid"),
+                        "file_name": data.get("file_name"),
+                        "extracted_insights": insights
+                    }
+
+                    # Salvar JSON
+                    _write_output_json(output_file, new_data)
+                    _append_checkpoint(checkpoint, {
+                        "uuid": data.get("uuid"),
+                        "sha256": text_sha256,
+                        "status": "ok",
+                    })
+                    outputs.append(str(output_file))
+                    processed.append((output_file, new_data, _upload_key(file_uuid, text_sha256)))
+                    processed_count += 1
+                    
+                except Exception as e:
+                    warnings.append(f"failed:{json_file.name}:{e}")
         
         # ENVIAR PARA ASIMOV
         asimov_upload_stats = {
@@ -335,74 +776,100 @@ class ExtractInsightsTool(BaseTool):
                 if not asimov.ensure_dataset().get("ok"):
                     warnings.append("asimov_ensure_dataset_failed")
                 else:
-                    extractor_json_files = sorted([p for p in extractor_path.rglob("*.json") if p.is_file()])
+                    uploaded_fp = extractor_path / UPLOADED_SET_FILE
+                    uploaded = _load_uploaded_set(uploaded_fp)
+                    uploaded_keys_fp = extractor_path / UPLOADED_KEYS_FILE
+                    uploaded_keys = _load_uploaded_set(uploaded_keys_fp)
                     
-                    for json_file in extractor_json_files:
+                    # Snippets de todos os arquivos pendentes, marcados com o arquivo de origem
+                    pending: list[tuple[Path, dict[str, Any], str, int]] = []
+                    tagged_snippets: list[tuple[str, dict[str, str]]] = []
+                    # Arquivos cujo upload não terminou com sucesso saem do uploaded.set e são retentados
+                    not_uploaded: list[str] = []
+                    
+                    for json_file, data, upload_key in processed:
                         try:
-                            data = json.loads(json_file.read_text(encoding="utf-8"))
+                            if data is None:
+                                # Arquivos retomados e já enviados (com este mesmo texto) nem são lidos
+                                if upload_key in uploaded:
+                                    continue
+                                data = orjson.loads(json_file.read_bytes())
                             
                             # Verificar se já tem upload
                             if "asimov_insights_upload" in data:
                                 upload_info = data.get("asimov_insights_upload", {})
                                 if upload_info.get("status") == "ok":
+                                    if upload_key not in uploaded:
+                                        _mark_uploaded(uploaded_fp, upload_key)
                                     continue
                             
                             insights = data.get("extracted_insights", {})
                             if not insights or "citacoes" not in insights:
                                 continue
                             
-                            # Formatar insights em snippets
-                            insight_snippets = _format_insights_for_asimov(
-                                insights, 
-                                file_uuid=data.get("uuid"),
-                                json_data=data
-                            )
-                            
-                            if insight_snippets:
-                                uploaded_total = 0
-                                upload_errors = []
-                                
-                                for batch_start in range(0, len(insight_snippets), MAX_ITEMS_PER_BATCH):
-                                    batch = insight_snippets[batch_start:batch_start + MAX_ITEMS_PER_BATCH]
-                                    result = asimov.upload_snippets(batch, dataset=dataset_name)
-                                    
-                                    if result.get("ok"):
-                                        uploaded_total += result.get("sent_items", len(batch))
-                                    else:
-                                        upload_errors.append({
-                                            "batch": (batch_start // MAX_ITEMS_PER_BATCH) + 1,
-                                            "error": result.get("reason") or result.get("error")
-                                        })
-                                
-                                asimov_upload = {
-                                    "attempted": len(insight_snippets),
-                                    "uploaded": uploaded_total,
-                                    "errors": upload_errors,
-                                }
-                                
-                                if len(upload_errors) == 0:
-                                    asimov_upload["status"] = "ok"
-                                    asimov_upload_stats["files_with_upload"] += 1
-                                elif uploaded_total > 0:
-                                    asimov_upload["status"] = "partial"
-                                    asimov_upload_stats["files_with_upload"] += 1
-                                else:
-                                    asimov_upload["status"] = "error"
-                                    asimov_upload_stats["files_with_errors"] += 1
-                                
-                                asimov_upload_stats["total_attempted"] += len(insight_snippets)
-                                asimov_upload_stats["total_uploaded"] += uploaded_total
-                                
-                                # Atualizar JSON
-                                data["asimov_insights_upload"] = asimov_upload
-                                json_file.write_text(
-                                    json.dumps(data, ensure_ascii=False, indent=2),
-                                    encoding="utf-8"
+                            # Formatar insights em snippets, descartando os que já estão no Asimov
+                            # (o de metadados tem chave fixa e é sempre reenviado, com a contagem atual)
+                            insight_snippets = [
+                                snippet
+                                for snippet in _format_insights_for_asimov(
+                                    insights, 
+                                    file_uuid=data.get("uuid"),
+                                    json_data=data
                                 )
+                                if snippet["key"] not in uploaded_keys
+                                or snippet["key"].endswith(META_SNIPPET_SUFFIX)
+                            ]
+                            
+                            pending.append((json_file, data, upload_key, len(insight_snippets)))
+                            tagged_snippets.extend((json_file.stem, snippet) for snippet in insight_snippets)
                                 
                         except Exception as e:
                             warnings.append(f"asimov_upload_error:{json_file.name}:{e}")
                             asimov_upload_stats["files_with_errors"] += 1
+                            not_uploaded.append(upload_key)
+                    
+                    upload_results = _upload_snippet_batches(asimov, dataset_name, tagged_snippets)
+                    
+                    for json_file, data, upload_key, attempted in pending:
+                        try:
+                            file_result = upload_results.get(json_file.stem) or {"uploaded": 0, "errors": [], "keys": []}
+                            uploaded_total = file_result["uploaded"]
+                            upload_errors = file_result["errors"]
+                            _mark_uploaded(uploaded_keys_fp, *file_result["keys"])
+                            
+                            asimov_upload = {
+                                "attempted": attempted,
+                                "uploaded": uploaded_total,
+                                "errors": upload_errors,
+                            }
+                            
+                            if len(upload_errors) == 0:
+                                asimov_upload["status"] = "ok"
+                                asimov_upload_stats["files_with_upload"] += 1
+                                if upload_key not in uploaded:
+                                    _mark_uploaded(uploaded_fp, upload_key)
+                            elif uploaded_total > 0:
+                                asimov_upload["status"] = "partial"
+                                asimov_upload_stats["files_with_upload"] += 1
+                                not_uploaded.append(upload_key)
+                            else:
+                                asimov_upload["status"] = "error"
+                                asimov_upload_stats["files_with_errors"] += 1
+                                not_uploaded.append(upload_key)
+                            
+                            asimov_upload_stats["total_attempted"] += attempted
+                            asimov_upload_stats["total_uploaded"] += uploaded_total
+                            
+                            # Atualizar JSON
+                            data["asimov_insights_upload"] = asimov_upload
+                            _write_output_json(json_file, data)
+                            
+                        except Exception as e:
+                            warnings.append(f"asimov_upload_error:{json_file.name}:{e}")
+                            asimov_upload_stats["files_with_errors"] += 1
+                            not_uploaded.append(upload_key)
+                    
+                    _unmark_uploaded(uploaded_fp, *not_uploaded)
                             
             except Exception as e:
                 warnings.append(f"asimov_setup_error:{e}")
@@ -1,91 +1,182 @@
 from __future__ import annotations
 
-import json
 import re
 import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, Type
+from xml.etree import ElementTree
 
+import orjson
 from crewai.tools import BaseTool
-from docx import Document
 from pydantic import BaseModel, Field
 
-# Padrões de limpeza combinados
-CLEANING_PATTERNS = [
-    (r'\s+', ' '),
-    (r'\*\*(.*?)\*\*', r'\1'),
-    (r'\*(.*?)\*', r'\1'),
-    (r'`(.*?)`', r'\1'),
-    (r'\?{2,}', '?'),
-    (r'\n{3,}', '\n\n'),
-    (r'!{3,}', '!'),
-    (r'\.{3,}', '...'),
-    (r'\([0-9:]+ - [0-9:]+\)\s*', ''),
-    (r' {2,}', ' '),
-]
+from desk_research.utils.file_walk import iter_files
+
+# Padrões de limpeza combinados numa única alternância: uma passada sobre o texto em vez de uma por padrão
+CLEANING_RE = re.compile(
+    r"(?P<ts>\([0-9:]+\s+-\s+[0-9:]+\)\s*)"
+    r"|(?P<bold>\*\*(?P<bold_inner>.*?)\*\*)"
+    r"|(?P<em>\*(?P<em_inner>.*?)\*)"
+    r"|(?P<code>`(?P<code_inner>.*?)`)"
+    r"|(?P<q>\?{2,})"
+    r"|(?P<excl>!{3,})"
+    r"|(?P<dots>\.{3,})"
+    r"|(?P<ws>\s+)",
+    re.DOTALL,
+)
+
+# Trechos que indicam algo além de espaços para o CLEANING_RE tratar
+CLEANING_HINTS = ("(", "*", "`", "??", "!!!", "....")
+
+CLEANING_SUBS = {
+    "ts": "",
+    "q": "?",
+    "excl": "!",
+    "dots": "...",
+    "ws": " ",
+}
+
+# Aspas tipográficas, travessões e caractere de substituição numa única passada
+CLEANING_TRANSLATE = str.maketrans({
+    "\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'",
+    "\u2014": "-", "\u2013": "-", "\ufffd": None,
+})
 
 CLEANING_REPLACES = {
-    '"': '"', '"': '"', ''': "'", ''': "'",
-    '—': '-', '–': '-', '': '',
     'nao': 'não', 'voce': 'você', 'pra': 'para',
 }
+# Só palavras inteiras: evita "naomi" -> "nãomi", "prato" -> "parato"
+CLEANING_REPLACES_RE = re.compile(r"\b(?:" + "|".join(CLEANING_REPLACES) + r")\b")
+
+# Textos menores que isso não são entrevistas (arquivo vazio, só título...)
+MIN_INTERVIEW_CHARS = 50
+
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+SUPPORTED_EXTS = frozenset({".docx"})
+
+# Tags WordprocessingML usadas na leitura do texto
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DOCX_P = f"{_W}p"
+DOCX_T = f"{_W}t"
+DOCX_TAB = f"{_W}tab"
+DOCX_BREAKS = frozenset({f"{_W}br", f"{_W}cr"})
+# Caixas de texto aparecem duas vezes: em mc:Choice (DrawingML) e em mc:Fallback (VML); lemos só a primeira
+DOCX_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+JSON_SUFFIXES = frozenset({".json"})
+
+# Abaixo disso o custo de subir o pool supera o ganho
+PROCESS_POOL_MIN_FILES = 8
 
 
 def _read_docx(fp: Path) -> str:
-    doc = Document(str(fp))
-    return "\n".join(p.text.strip() for p in doc.paragraphs if p.text.strip()).strip()
+    """
+    Lê o texto dos parágrafos direto do word/document.xml, em streaming, sem montar o modelo do python-docx.
+    Inclui parágrafos de tabelas e caixas de texto; parágrafos aninhados (caixa de texto dentro de
+    um parágrafo) são emitidos separadamente, antes do parágrafo que os contém.
+    """
+    paragraphs: list[str] = []
+    # Um buffer de runs por parágrafo aberto
+    stack: list[list[str]] = []
+    fallback_depth = 0
+    with zipfile.ZipFile(fp) as z, z.open("word/document.xml") as f:
+        for event, el in ElementTree.iterparse(f, events=("start", "end")):
+            tag = el.tag
+            if tag == DOCX_FALLBACK:
+                fallback_depth += 1 if event == "start" else -1
+                continue
+            if fallback_depth:
+                continue
+            if event == "start":
+                if tag == DOCX_P:
+                    stack.append([])
+                continue
+            if not stack:
+                continue
+            if tag == DOCX_T and el.text:
+                stack[-1].append(el.text)
+            elif tag == DOCX_TAB:
+                stack[-1].append("\t")
+            elif tag in DOCX_BREAKS:
+                stack[-1].append("\n")
+            elif tag == DOCX_P:
+                if s := "".join(stack.pop()).strip():
+                    paragraphs.append(s)
+                el.clear()
+    return "\n".join(paragraphs)
+
+
+def _clean_match(m: re.Match[str]) -> str:
+    kind = m.lastgroup
+    if kind in ("bold", "em", "code"):
+        # o conteúdo da marcação também passa pela limpeza (espaços, pontuação repetida...)
+        return CLEANING_RE.sub(_clean_match, m.group(f"{kind}_inner"))
+    return CLEANING_SUBS[kind]
 
 
 def _clean_text(text: str) -> str:
-    if not text:
+    s = text.strip() if text else ""
+    if len(s) < MIN_INTERVIEW_CHARS:
         return ""
     
-    t = text.strip()
-    for pattern, repl in CLEANING_PATTERNS:
-        t = re.sub(pattern, repl, t)
-    for old, new in CLEANING_REPLACES.items():
-        t = t.replace(old, new)
+    if any(hint in s for hint in CLEANING_HINTS):
+        t = CLEANING_RE.sub(_clean_match, s)
+    else:
+        # sem nada para remover: só normaliza espaços
+        t = " ".join(s.split())
+    if "  " in t:
+        # marcação removida entre dois espaços (ex.: "a ** b")
+        t = " ".join(t.split())
+    t = t.translate(CLEANING_TRANSLATE)
+    t = CLEANING_REPLACES_RE.sub(lambda m: CLEANING_REPLACES[m.group()], t)
     
     return t.strip()
 
 
-def _is_processed(file_name: str, output_dir: Path) -> str | None:
-    for json_file in output_dir.rglob("*.json"):
+def _build_processed_index(output_dir: Path) -> dict[str, str]:
+    """Indexa uma única vez os JSONs já gerados: file_name de origem -> caminho do JSON."""
+    processed: dict[str, str] = {}
+    for json_file in iter_files(output_dir, JSON_SUFFIXES):
         try:
-            if json.loads(json_file.read_text(encoding="utf-8")).get("file_name") == file_name:
-                return str(json_file)
+            file_name = orjson.loads(json_file.read_bytes()).get("file_name")
         except Exception:
             continue
-    return None
-
-
-def _process_file(fp: Path, output_dir: Path, warnings: list[str]) -> str | None:
-    """Processa um arquivo: extrai, limpa e salva JSON."""
-    if existing := _is_processed(fp.name, output_dir):
-        return existing
-    
-    text = _read_docx(fp)
-    if not text:
-        warnings.append(f"empty_text:{fp.name}")
-        return None
-    
-    cleaned = _clean_text(text)
-    if not cleaned:
-        warnings.append(f"empty_after_cleaning:{fp.name}")
-        return None
-    
-    file_uuid = str(uuid.uuid4())
-    
-    payload = {
-        "uuid": file_uuid,
-        "source_file": str(fp),
-        "file_name": fp.name,
-        "text": cleaned,
-    }
-    
-    out_fp = output_dir / f"{file_uuid}.json"
-    out_fp.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    return str(out_fp)
+        if file_name:
+            processed.setdefault(file_name, str(json_file))
+    return processed
+
+
+def _process_file(fp: Path, output_dir: Path) -> tuple[str | None, list[str]]:
+    """Processa um arquivo: extrai, limpa e salva JSON. Roda num processo worker."""
+    warnings: list[str] = []
+    try:
+        text = _read_docx(fp)
+        if not text:
+            warnings.append(f"empty_text:{fp.name}")
+            return None, warnings
+        
+        cleaned = _clean_text(text)
+        if not cleaned:
+            warnings.append(f"empty_after_cleaning:{fp.name}")
+            return None, warnings
+        
+        file_uuid = str(uuid.uuid4())
+        
+        payload = {
+            "uuid": file_uuid,
+            "source_file": str(fp),
+            "file_name": fp.name,
+            "text": cleaned,
+        }
+        
+        out_fp = output_dir / f"{file_uuid}.json"
+        out_fp.write_bytes(orjson.dumps(payload, option=JSON_OPTIONS))
+        return str(out_fp), warnings
+    except Exception as e:
+        warnings.append(f"failed:{fp.name}:{e}")
+        return None, warnings
 
 
 class IngestCleanFolderArgs(BaseModel):
@@ -110,17 +201,38 @@ class IngestCleanFolderTool(BaseTool):
         
         out_path.mkdir(parents=True, exist_ok=True)
         
-        input_files = sorted([p for p in in_path.rglob("*.docx") if p.is_file()])
+        input_files = sorted(iter_files(in_path, SUPPORTED_EXTS))
         
         warnings: list[str] = []
         outputs: list[str] = []
+        processed = _build_processed_index(out_path)
+        
+        # dedup resolvido no processo principal; só os arquivos novos vão para o pool
+        results: dict[Path, str | None] = {}
+        pending: dict[str, Path] = {}
+        for fp in input_files:
+            if existing := processed.get(fp.name):
+                results[fp] = existing
+            else:
+                pending.setdefault(fp.name, fp)
+        
+        to_process = list(pending.values())
+        if len(to_process) >= PROCESS_POOL_MIN_FILES:
+            with ProcessPoolExecutor() as executor:
+                done = list(executor.map(_process_file, to_process, [out_path] * len(to_process), chunksize=4))
+        else:
+            done = [_process_file(fp, out_path) for fp in to_process]
+        
+        for fp, (result, file_warnings) in zip(to_process, done):
+            warnings.extend(file_warnings)
+            results[fp] = result
+            if result:
+                processed[fp.name] = result
         
         for fp in input_files:
-            try:
-                if result := _process_file(fp, out_path, warnings):
-                    outputs.append(result)
-            except Exception as e:
-                warnings.append(f"failed:{fp.name}:{e}")
+            # arquivos com nome repetido reaproveitam a saída do primeiro
+            if result := results.get(fp) or processed.get(fp.name):
+                outputs.append(result)
         
         return {
             "ok": True,
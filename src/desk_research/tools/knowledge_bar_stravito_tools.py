@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import random
 import time
 from typing import Any, ClassVar, Dict, List
 
@@ -9,9 +10,25 @@ from crewai.tools import BaseTool
 from desk_research.utils.makelog.makeLog import make_log
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
+# Sessão compartilhada: o polling faz dezenas de GETs no mesmo host, sem novo handshake TLS a cada um
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+def _poll_delay(attempt: int, base: float, cap: float) -> float:
+    """Backoff exponencial com jitter: respostas rápidas são pegas cedo, as lentas não gastam requisições."""
+    return min(cap, base * (1.6 ** attempt)) + random.uniform(0, 0.3)
+
 def _log(msg: str) -> None:
     print(f"[KnowledgeBarStravitoTool] {msg}")
 
@@ -106,7 +123,7 @@ class KnowledgeBarStravitoTool(BaseTool):
 
             _log(f"[Info] Enviando pergunta: {query[:50]}..." if len(query) > 50 else f"[Info] Enviando pergunta: {query}")
 
-            post_resp = requests.post(url, headers=self.HEADERS, json=payload)
+            post_resp = _SESSION.post(url, headers=self.HEADERS, json=payload)
             post_resp.raise_for_status()
 
             data_init = post_resp.json()
@@ -122,12 +139,20 @@ class KnowledgeBarStravitoTool(BaseTool):
         except requests.RequestException as e:
             raise Exception(f"Erro de conexão: {str(e)}")
 
-    def get(self, conversation_id: str, message_id: str, max_retries: int = 30, sleep_sec: int = 2):
+    def get(
+        self,
+        conversation_id: str,
+        message_id: str,
+        max_retries: int = 30,
+        sleep_sec: float = 0.5,
+        max_sleep_sec: float = 8.0,
+    ):
         get_url = f"{self.BASE_URL}/conversations/{conversation_id}/messages/{message_id}"
+        started = time.monotonic()
 
         for attempt in range(max_retries):
             try:
-                get_resp = requests.get(get_url, headers=self.HEADERS)
+                get_resp = _SESSION.get(get_url, headers=self.HEADERS)
                 get_resp.raise_for_status()
                 
                 data_msg = get_resp.json()
@@ -155,16 +180,16 @@ class KnowledgeBarStravitoTool(BaseTool):
                 elif state == "IN_PROGRESS":
                     if attempt % 5 == 0:
                         print(f"[Info] Processando... (tentativa {attempt + 1}/{max_retries})")
-                    time.sleep(sleep_sec)
+                    time.sleep(_poll_delay(attempt, sleep_sec, max_sleep_sec))
                 else:
                     print(f"[Warning] Estado desconhecido: {state}")
-                    time.sleep(sleep_sec)
+                    time.sleep(_poll_delay(attempt, sleep_sec, max_sleep_sec))
                     
             except requests.exceptions.HTTPError as e:
                 return {"error": f"Erro ao buscar resposta: {str(e)}"}
             except requests.RequestException as e:
                 return {"error": f"Erro de conexão durante polling: {str(e)}"}
         
-        return {"error": f"Timeout: A resposta demorou mais de {max_retries * sleep_sec} segundos para ser gerada."}
+        return {"error": f"Timeout: A resposta demorou mais de {int(time.monotonic() - started)} segundos para ser gerada."}
 
 knowledge_bar_stravito_tool = KnowledgeBarStravitoTool()
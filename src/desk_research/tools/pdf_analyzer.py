@@ -1,104 +1,253 @@
-﻿import requests
+﻿import hashlib
+import os
+import orjson
+import requests
 import PyPDF2
 import pdfplumber
-import io
 import re
+import tempfile
+import time
+from itertools import islice
+from pathlib import Path
+from urllib.parse import urljoin
 from crewai.tools import tool
-from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-@tool("pdf_analyzer")
-def pdf_analyzer_tool(url: str) -> str:
-    """
-    Analisa um PDF acadêmico extraindo todo o conteúdo textual.
+# PyMuPDF é opcional (licença AGPL): quando instalado, extrai texto bem mais rápido que pdfplumber
+try:
+    import fitz
+except ImportError:
+    fitz = None
 
-    Args:
-        url: URL direta do PDF
+PDF_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,application/pdf;q=0.9,*/*;q=0.8",
+    "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Referer": "https://www.google.com/",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+}
 
-    Returns:
-        Texto completo extraído do PDF
-    """
+# Sessão compartilhada entre chamadas: reaproveita conexões TCP/TLS por host
+# e refaz GET/HEAD em erros transitórios do servidor
+_SESSION = requests.Session()
+_SESSION.headers.update(PDF_HEADERS)
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+# PDFs até esse tamanho ficam em memória; acima disso o spool vai para disco
+PDF_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+PDF_CHUNK_BYTES = 64 * 1024
+
+# Limite de páginas extraídas (0 = todas): artigos cabem folgados, livros/teses não viram texto gigante para a LLM
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "60")) or None
+
+# Quebras de linha em excesso e espaços repetidos numa única passada
+_WS_CLEANUP_RE = re.compile(r"\n{3,}| {2,}")
+_ABSTRACT_RE = re.compile(r"(?:Abstract|ABSTRACT)[:\s]+(.*?)(?:\n\n|\n[A-Z])", re.DOTALL | re.IGNORECASE)
+
+SECTION_NAMES = ("Introduction", "Methodology", "Methods", "Results", "Discussion", "Conclusion")
+# Todas as seções numa única varredura; o \n final fica no lookahead para não consumir o início do próximo título
+_SECTION_RE = re.compile(
+    r"\n\s*(?:\d+\.?\s*)?(" + "|".join(SECTION_NAMES) + r")\s*(?=\n)",
+    re.IGNORECASE,
+)
+
+# Texto extraído fica em cache por URL: o mesmo paper analisado de novo não é baixado outra vez
+PDF_CACHE_DIR = Path(
+    os.getenv("PDF_CACHE_DIR") or Path.home() / ".cache" / "desk_research" / "pdfs"
+).expanduser()
+# Entradas mais velhas que isso são baixadas de novo; acima do limite de arquivos, as mais antigas saem
+PDF_CACHE_TTL_S = float(os.getenv("PDF_CACHE_TTL_S", str(7 * 24 * 3600)))
+PDF_CACHE_MAX_FILES = int(os.getenv("PDF_CACHE_MAX_FILES", "500"))
+
+
+def _spool_response(response: requests.Response) -> tempfile.SpooledTemporaryFile:
+    """Copia o corpo da resposta em blocos para um arquivo temporário, sem manter o PDF inteiro duplicado em memória."""
+    buf = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_BYTES)
     try:
-        session = requests.Session()
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,application/pdf;q=0.9,*/*;q=0.8",
-            "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Referer": "https://www.google.com/",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-        }
-        session.headers.update(headers)
+        for chunk in response.iter_content(chunk_size=PDF_CHUNK_BYTES):
+            buf.write(chunk)
+    finally:
+        response.close()
+    buf.seek(0)
+    return buf
 
+
+def _ws_cleanup(m: re.Match[str]) -> str:
+    return "\n\n" if m.group()[0] == "\n" else " "
+
+
+def _pdf_cache_path(url: str) -> Path:
+    """Caminho do texto extraído (e contagem de páginas) em cache, chaveado por sha256 de (limite de páginas, URL)."""
+    digest = hashlib.sha256(f"{PDF_MAX_PAGES}\n{url}".encode("utf-8")).hexdigest()
+    return PDF_CACHE_DIR / f"{digest}.json"
+
+
+def _read_pdf_cache(cache_fp: Path) -> dict | None:
+    """Entrada do cache ainda dentro de PDF_CACHE_TTL_S, ou None (entradas vencidas são apagadas)."""
+    try:
+        if time.time() - cache_fp.stat().st_mtime > PDF_CACHE_TTL_S:
+            cache_fp.unlink(missing_ok=True)
+            return None
+        return orjson.loads(cache_fp.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def _prune_pdf_cache() -> None:
+    """Mantém no máximo PDF_CACHE_MAX_FILES entradas, removendo as de mtime mais antigo."""
+    with os.scandir(PDF_CACHE_DIR) as entries:
+        files = [(e.stat().st_mtime, e.path) for e in entries if e.name.endswith(".json") and e.is_file()]
+    if len(files) <= PDF_CACHE_MAX_FILES:
+        return
+    files.sort()
+    for _, path in files[: len(files) - PDF_CACHE_MAX_FILES]:
         try:
-            head_resp = session.head(url, allow_redirects=True, timeout=10)
-            content_type = head_resp.headers.get("Content-Type", "").lower()
-
-            if "application/pdf" not in content_type:
-                get_resp = session.get(url, timeout=15)
-                get_resp.raise_for_status()
-
-                if (
-                    "application/pdf"
-                    in get_resp.headers.get("Content-Type", "").lower()
-                ):
-                    response = get_resp
-                else:
-                    soup = BeautifulSoup(get_resp.content, "html.parser")
-
-                    pdf_link = None
-                    for a in soup.find_all("a", href=True):
-                        href = a["href"]
-                        if (
-                            href.lower().endswith(".pdf")
-                            or "download" in href.lower()
-                            or "pdf" in a.get_text().lower()
-                        ):
-                            pdf_link = href
-                            if not pdf_link.startswith("http"):
-                                from urllib.parse import urljoin
-
-                                pdf_link = urljoin(url, pdf_link)
-                            break
-
-                    if pdf_link:
-                        url = pdf_link
-                        response = session.get(url, timeout=30)
-                    else:
-                        return f"ERRO: URL retorna HTML e nenhum link de PDF explícito foi encontrado: {url}"
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _find_pdf_link(content: bytes) -> str | None:
+    """Primeiro <a> com cara de PDF (href .pdf/download ou texto com "pdf"), numa passada pelo parser C do lxml."""
+    if not content:
+        return None
+    for a in lxml_html.fromstring(content).iter("a"):
+        href = a.get("href")
+        if href is None:
+            continue
+        href_lower = href.lower()
+        if (
+            href_lower.endswith(".pdf")
+            or "download" in href_lower
+            or "pdf" in a.text_content().lower()
+        ):
+            return href
+    return None
+
+
+def _fetch_pdf(url: str) -> tuple[str, requests.Response | None, str | None]:
+    """
+    Resolve a URL para a resposta do PDF (seguindo o link quando a URL é uma página HTML).
+    Retorna (url final, resposta, mensagem de erro).
+    """
+    session = _SESSION
+
+    try:
+        # um único GET em streaming: o Content-Type é conferido antes de ler o corpo,
+        # então não é preciso um HEAD antes (e vários servidores respondem HEAD errado)
+        get_resp = session.get(url, timeout=30, stream=True)
+        get_resp.raise_for_status()
+
+        if "application/pdf" in get_resp.headers.get("Content-Type", "").lower():
+            response = get_resp
+        else:
+            pdf_link = _find_pdf_link(get_resp.content)
+            if pdf_link and not pdf_link.startswith("http"):
+                pdf_link = urljoin(url, pdf_link)
+
+            if pdf_link:
+                url = pdf_link
+                response = session.get(url, timeout=30, stream=True)
             else:
-                response = session.get(url, timeout=30)
+                return url, None, f"ERRO: URL retorna HTML e nenhum link de PDF explícito foi encontrado: {url}"
 
-        except Exception as e:
-            return f"FALHA NO ACESSO AO PDF: Não foi possível baixar o PDF. Continue analisando os demais papers normalmente."
+    except Exception as e:
+        return url, None, f"FALHA NO ACESSO AO PDF: Não foi possível baixar o PDF. Continue analisando os demais papers normalmente."
+
+    return url, response, None
 
-        response.raise_for_status()
 
-        pdf_bytes = io.BytesIO(response.content)
+def _extract_text(response: requests.Response) -> tuple[str, int]:
+    """
+    Extrai o texto das primeiras PDF_MAX_PAGES páginas com PyMuPDF (se instalado), depois pdfplumber, por fim PyPDF2.
+    Retorna (texto, total de páginas do PDF).
+    """
+    with _spool_response(response) as pdf_bytes:
+        # sem a assinatura %PDF no início não é PDF (página de erro, login...): nem abre os parsers
+        if b"%PDF" not in pdf_bytes.read(1024):
+            return "", 0
+        pdf_bytes.seek(0)
+
+        if fitz is not None:
+            try:
+                with fitz.open(stream=pdf_bytes.read(), filetype="pdf") as doc:
+                    text = "\n\n".join(t for t in (page.get_text("text") for page in islice(doc, PDF_MAX_PAGES)) if t.strip())
+                    total_pages = doc.page_count
+                if text:
+                    return text, total_pages
+            except Exception:
+                pass
+            pdf_bytes.seek(0)
 
         try:
             text_parts = []
             with pdfplumber.open(pdf_bytes) as pdf:
-                for page in pdf.pages:
+                total_pages = len(pdf.pages)
+                for page in islice(pdf.pages, PDF_MAX_PAGES):
                     page_text = page.extract_text()
+                    # libera os objetos de layout da página; sem isso o pdfplumber mantém todas em memória
+                    page.close()
                     if page_text:
                         text_parts.append(page_text)
-            text = "\n\n".join(text_parts)
+            return "\n\n".join(text_parts), total_pages
         except Exception as e:
             pdf_bytes.seek(0)
             text_parts = []
             reader = PyPDF2.PdfReader(pdf_bytes)
-            for page in reader.pages:
+            for page in islice(reader.pages, PDF_MAX_PAGES):
                 page_text = page.extract_text()
                 if page_text:
                     text_parts.append(page_text)
-            text = "\n\n".join(text_parts)
+            return "\n\n".join(text_parts), len(reader.pages)
 
-        if not text or len(text) < 100:
-            return "ERRO: Não foi possível extrair texto do PDF."
 
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        text = re.sub(r" {2,}", " ", text)
+@tool("pdf_analyzer")
+def pdf_analyzer_tool(url: str) -> str:
+    """
+    Analisa um PDF acadêmico extraindo o conteúdo textual.
+
+    Args:
+        url: URL direta do PDF
+
+    Returns:
+        Texto extraído do PDF (até PDF_MAX_PAGES páginas; quando o limite corta o
+        documento, a saída informa quantas páginas foram lidas do total)
+    """
+    try:
+        cache_fp = _pdf_cache_path(url)
+        cached = _read_pdf_cache(cache_fp) if cache_fp.exists() else None
+        if cached is not None:
+            text, total_pages = cached["text"], cached["total_pages"]
+        else:
+            url, response, error = _fetch_pdf(url)
+            if error:
+                return error
+
+            response.raise_for_status()
+            text, total_pages = _extract_text(response)
+
+            if not text or len(text) < 100:
+                return "ERRO: Não foi possível extrair texto do PDF."
+
+            text = _WS_CLEANUP_RE.sub(_ws_cleanup, text)
+
+            cache_fp.parent.mkdir(parents=True, exist_ok=True)
+            tmp_fp = cache_fp.with_suffix(".tmp")
+            tmp_fp.write_bytes(orjson.dumps({"text": text, "total_pages": total_pages}))
+            os.replace(tmp_fp, cache_fp)
+            _prune_pdf_cache()
+
+        truncated = PDF_MAX_PAGES is not None and total_pages > PDF_MAX_PAGES
 
         metadata = {"title": "", "abstract": "", "sections": []}
 
@@ -108,24 +257,12 @@ def pdf_analyzer_tool(url: str) -> str:
                 metadata["title"] = line.strip()
                 break
 
-        abstract_match = re.search(
-            r"(?:Abstract|ABSTRACT)[:\s]+(.*?)(?:\n\n|\n[A-Z])",
-            text,
-            re.DOTALL | re.IGNORECASE,
-        )
+        abstract_match = _ABSTRACT_RE.search(text)
         if abstract_match:
             metadata["abstract"] = abstract_match.group(1).strip()[:500]
 
-        for section in [
-            "Introduction",
-            "Methodology",
-            "Methods",
-            "Results",
-            "Discussion",
-            "Conclusion",
-        ]:
-            if re.search(rf"\n\s*(\d+\.?\s*)?{section}\s*\n", text, re.IGNORECASE):
-                metadata["sections"].append(section)
+        found = {m.group(1).lower() for m in _SECTION_RE.finditer(text)}
+        metadata["sections"] = [section for section in SECTION_NAMES if section.lower() in found]
 
         parts = [
             "=" * 80,
@@ -133,8 +270,12 @@ def pdf_analyzer_tool(url: str) -> str:
             "=" * 80,
             f"\n📄 URL: {url}",
             f"📏 Tamanho: {len(text)} caracteres (~{len(text.split())} palavras)",
-            "\n" + "=" * 80,
         ]
+        if truncated:
+            parts.append(
+                f"⚠️ CONTEÚDO TRUNCADO: foram lidas {PDF_MAX_PAGES} de {total_pages} páginas (limite PDF_MAX_PAGES)"
+            )
+        parts.append("\n" + "=" * 80)
 
         if metadata["title"]:
             parts.append(f"\n📋 TÍTULO:\n{metadata['title']}")
@@ -146,6 +287,7 @@ def pdf_analyzer_tool(url: str) -> str:
         parts.extend(
             [
                 "\n" + "=" * 80,
+                # marcador usado por quem consome a saída (academic._extract_content_from_pdfs); o corte já vem avisado no cabeçalho
                 "CONTEÚDO COMPLETO:",
                 "=" * 80,
                 text,
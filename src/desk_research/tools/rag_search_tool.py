@@ -4,6 +4,7 @@ import json
 import os
 from typing import Type
 
+import orjson
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
@@ -47,9 +48,10 @@ class RAGSearchTool(BaseTool):
     def _parse_snippet_content(self, content: str) -> dict:
         """Tenta fazer parse do conteúdo do snippet (JSON estruturado)."""
         try:
-            return json.loads(content)
-        except:
+            parsed = orjson.loads(content)
+        except (orjson.JSONDecodeError, TypeError):
             return {"raw_content": content}
+        return parsed if isinstance(parsed, dict) else {"raw_content": content}
 
     def _format_snippet_info(self, snippet: dict, idx: int) -> str:
         """Formata informações estruturadas de um snippet."""
@@ -74,39 +76,39 @@ class RAGSearchTool(BaseTool):
             quota = parsed.get("quota", {})
             marcas = parsed.get("marcaMencionada", [])
             
-            info = (
+            info = [
                 f"\n--- Snippet {idx} (CITAÇÃO - similaridade: {similarity:.3f}) ---\n"
-            )
+            ]
             
             # Informações demográficas
             if quota:
                 idade = quota.get("idade", "Não informado")
                 regiao = quota.get("regiao", "Não informado")
                 classe = quota.get("classeSocial", "Não informado")
-                info += f"Participante: {idade} - {regiao} - Classe {classe}\n"
+                info.append(f"Participante: {idade} - {regiao} - Classe {classe}\n")
             
             # Data da entrevista - SEMPRE incluir (obrigatório)
             data_entrevista = parsed.get("dataEntrevista", "Não informado")
-            info += f"Data da entrevista: {data_entrevista}\n"
+            info.append(f"Data da entrevista: {data_entrevista}\n")
             
             # Marcas mencionadas
             if marcas:
-                info += f"Marcas mencionadas: {', '.join(marcas)}\n"
+                info.append(f"Marcas mencionadas: {', '.join(marcas)}\n")
             
             # Pergunta
             pergunta = parsed.get("pergunta", "")
             if pergunta and pergunta != "Não identificada":
-                info += f"Pergunta: {pergunta}\n"
+                info.append(f"Pergunta: {pergunta}\n")
             
             # Citação
-            info += f"Citação: {parsed.get('citacao', '')}\n"
+            info.append(f"Citação: {parsed.get('citacao', '')}\n")
             
             # Insight
             insight = parsed.get("insight", "")
             if insight:
-                info += f"Insight: {insight}\n"
+                info.append(f"Insight: {insight}\n")
             
-            return info
+            return "".join(info)
         
         # Fallback: conteúdo raw
         return (
@@ -189,23 +191,21 @@ class RAGSearchTool(BaseTool):
                 snippets = result_json.get("snippets", [])
                 usage = result_json.get("usage", {})
                 
-                response_text = (
+                parts = [
                     f"RESPOSTA DO RAG:\n{content}\n\n"
-                    f"SNIPPETS USADOS COMO CONTEXTO ({snippets} snippets encontrados):"
-                )
-                
-                for idx, snippet in enumerate(snippets, 1):
-                    response_text += self._format_snippet_info(snippet, idx)
+                    f"SNIPPETS USADOS COMO CONTEXTO ({len(snippets)} snippets encontrados):"
+                ]
+                parts.extend(self._format_snippet_info(snippet, idx) for idx, snippet in enumerate(snippets, 1))
                 
                 if usage:
-                    response_text += (
+                    parts.append(
                         f"\n\nUSO DE TOKENS: "
                         f"{usage.get('total_tokens', 'N/A')} tokens totais "
                         f"({usage.get('prompt_tokens', 'N/A')} prompt + "
                         f"{usage.get('completion_tokens', 'N/A')} completion)"
                     )
                 
-                return response_text
+                return "".join(parts)
             else:
                 error_msg = result.get("error") or result.get("reason", "Erro desconhecido")
                 return f"Erro na busca RAG: {error_msg}"
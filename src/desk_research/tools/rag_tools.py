@@ -1,21 +1,39 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 import os
+import threading
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
-import requests
+import orjson
 from dotenv import load_dotenv
 
 from desk_research.tools.asimov_client import AsimovClient, _safe_json
 from desk_research.utils.makelog.makeLog import make_log
 
 
+@lru_cache(maxsize=1)
 def _load_env() -> None:
     load_dotenv(override=False)
 
 
+_load_env()
+
+# Cache em memória das respostas do RAG: (momento do cache, resultado) por hash dos argumentos
+RAG_CACHE_TTL_S = float(os.getenv("RAG_CACHE_TTL_S", "1800"))
+RAG_CACHE_MAX_ITEMS = 512
+_RAG_CACHE: dict[str, tuple[float, dict[str, Any]]] = {}
+_RAG_CACHE_LOCK = threading.Lock()
+
+# Primeiro intervalo do polling de status; dobra a cada tentativa até poll_sleep_s
+POLL_INITIAL_S = 0.1
+
+
+@lru_cache(maxsize=1)
 def _get_chat_base() -> str:
     """
     Base do chat (api/v2), conforme orientação do Coradini.
@@ -26,6 +44,7 @@ def _get_chat_base() -> str:
     return base.rstrip("/")
 
 
+@lru_cache(maxsize=1)
 def _get_chat_key() -> str:
     """
     Chave do chat. Normalmente OPENAI_API_KEY no .env.
@@ -35,6 +54,7 @@ def _get_chat_key() -> str:
 
 
 def _chat_headers() -> dict[str, str]:
+    """Headers do chat; um dict novo a cada chamada (a chave lida do env fica em cache)."""
     k = _get_chat_key()
     # Mantém compat com APIM: tenta enviar também subscription/x-api-key
     return {
@@ -45,6 +65,34 @@ def _chat_headers() -> dict[str, str]:
     }
 
 
+def _rag_cache_key(*parts: Any) -> str:
+    return hashlib.sha256(orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _rag_cache_get(key: str) -> dict[str, Any] | None:
+    with _RAG_CACHE_LOCK:
+        entry = _RAG_CACHE.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > RAG_CACHE_TTL_S:
+            del _RAG_CACHE[key]
+            return None
+    # cópia: quem recebe pode alterar o resultado sem afetar os próximos acertos do cache
+    return copy.deepcopy(result)
+
+
+def _rag_cache_put(key: str, result: dict[str, Any]) -> None:
+    if RAG_CACHE_TTL_S <= 0:
+        return
+    with _RAG_CACHE_LOCK:
+        _RAG_CACHE.pop(key, None)
+        while len(_RAG_CACHE) >= RAG_CACHE_MAX_ITEMS:
+            # dict mantém ordem de inserção: o primeiro é o mais antigo
+            del _RAG_CACHE[next(iter(_RAG_CACHE))]
+        _RAG_CACHE[key] = (time.monotonic(), copy.deepcopy(result))
+
+
 @dataclass(frozen=True)
 class RAG:
     """
@@ -63,6 +111,40 @@ class RAG:
         prompt_template: str | None = None,
         poll_attempts: int = 10,
         poll_sleep_s: float = 2.0,
+    ) -> dict[str, Any]:
+        """
+        Completion com contexto do dataset. Respostas bem-sucedidas ficam em cache por RAG_CACHE_TTL_S,
+        então a mesma pergunta repetida por outro agente não refaz POST + polling.
+        """
+        key = _rag_cache_key(messages, dataset, model, temperature, max_tokens, prompt_template)
+        if (cached := _rag_cache_get(key)) is not None:
+            return cached
+
+        result = self._completion_with_context(
+            messages=messages,
+            dataset=dataset,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            prompt_template=prompt_template,
+            poll_attempts=poll_attempts,
+            poll_sleep_s=poll_sleep_s,
+        )
+        if result.get("ok"):
+            _rag_cache_put(key, result)
+        return result
+
+    def _completion_with_context(
+        self,
+        *,
+        messages: list[dict[str, str]],
+        dataset: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        prompt_template: str | None,
+        poll_attempts: int,
+        poll_sleep_s: float,
     ) -> dict[str, Any]:
         chat_base = _get_chat_base()
         if not chat_base:
@@ -83,8 +165,10 @@ class RAG:
         base_clean = chat_base.rstrip("/")
         url = f"{base_clean}/api/completions/context"
         headers = _chat_headers()
+        # sessão pooled do AsimovClient: POST, polling e resultado reaproveitam a mesma conexão TLS
+        session = self.client.session
         
-        resp = requests.post(
+        resp = session.post(
             url,
             headers=headers,
             json=payload,
@@ -106,15 +190,23 @@ class RAG:
         if not uuid:
             return {"ok": False, "reason": "missing_uuid", "status": resp.status_code, "json": init_json}
 
-        time.sleep(2)
         done = False
         status_payload: dict[str, Any] | None = None
-        base_clean = chat_base.rstrip("/")
         status_url = f"{base_clean}/api/completions/status/{uuid}"
-        headers = _chat_headers()
+        # No máximo poll_attempts consultas, dentro da mesma janela total de antes (2s iniciais +
+        # poll_attempts * poll_sleep_s), o que acabar primeiro. O backoff geométrico a partir de
+        # POLL_INITIAL_S detecta jobs rápidos em frações de segundo; a última consulta espera o
+        # restante da janela, para que o limite de consultas não encurte o tempo total de espera
+        deadline = time.monotonic() + 2 + poll_attempts * poll_sleep_s
+        attempt = 0
         
-        for attempt in range(poll_attempts):
-            sresp = requests.get(
+        while True:
+            delay = min(poll_sleep_s, POLL_INITIAL_S * (2 ** min(attempt, 10)))
+            if attempt == poll_attempts - 1:
+                delay = max(delay, deadline - time.monotonic())
+            time.sleep(delay)
+            attempt += 1
+            sresp = session.get(
                 status_url,
                 headers=headers,
                 timeout=60,
@@ -127,11 +219,10 @@ class RAG:
                 if status == 2:
                     done = True
                     break
-            time.sleep(poll_sleep_s)
+            if attempt >= poll_attempts or time.monotonic() >= deadline:
+                break
 
-        base_clean = chat_base.rstrip("/")
         result_url = f"{base_clean}/api/completions/context/{uuid}"
-        headers = _chat_headers()
         
         if not done:
             return {
@@ -140,10 +231,10 @@ class RAG:
                 "done": done,
                 "status_payload": status_payload,
                 "reason": "processing_not_complete",
-                "error": f"Processamento não completou após {poll_attempts} tentativas. Status final: {status_payload.get('status') if status_payload else 'unknown'}",
+                "error": f"Processamento não completou após {attempt} tentativas. Status final: {status_payload.get('status') if status_payload else 'unknown'}",
             }
                 
-        rresp = requests.get(
+        rresp = session.get(
             result_url,
             headers=headers,
             timeout=120,
@@ -185,5 +276,5 @@ class RAG:
 
 
 def get_rag_from_env() -> RAG:
-    client = AsimovClient.from_env()
+    client = AsimovClient.shared_from_env()
     return RAG(client=client)
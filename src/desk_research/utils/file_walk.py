@@ -0,0 +1,17 @@
+import os
+from pathlib import Path
+from typing import Iterator
+
+
+def iter_files(root: Path, suffixes: frozenset[str]) -> Iterator[Path]:
+    """
+    Percorre `root` recursivamente com os.scandir e devolve os arquivos cuja extensão
+    (em minúsculas, com ponto) está em `suffixes`. O DirEntry já traz o tipo em cache,
+    então não há um stat por arquivo como em rglob + is_file.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(Path(entry.path), suffixes)
+            elif os.path.splitext(entry.name)[1].lower() in suffixes and entry.is_file():
+                yield Path(entry.path)
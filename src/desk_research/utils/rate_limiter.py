@@ -0,0 +1,35 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Limitador token bucket thread-safe: `rate` unidades a cada `per` segundos, com rajada até `rate`.
+    Uma instância compartilhada entre threads mantém as chamadas logo abaixo da cota (RPM/TPM)
+    em vez de deixar cada worker descobrir o limite via 429.
+    Com rate <= 0 o limitador fica desligado.
+    """
+
+    def __init__(self, rate: float, per: float = 60.0) -> None:
+        self.capacity = float(rate)
+        self.fill_rate = float(rate) / per if rate > 0 else 0.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> None:
+        if self.fill_rate <= 0:
+            return
+
+        # pedidos maiores que a capacidade esperam o balde encher por completo
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.fill_rate
+            time.sleep(wait)
@@ -0,0 +1,84 @@
+import os
+import re
+import sys
+
+import pytest
+
+# Ensure src is in path for testing if not installed
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from desk_research.tools.ingestion_clean_tool import MIN_INTERVIEW_CHARS, _clean_text
+
+# Original sequential pipeline (one re.sub per pattern), used as the reference
+OLD_CLEANING_PATTERNS = [
+    (r'\s+', ' '),
+    (r'\*\*(.*?)\*\*', r'\1'),
+    (r'\*(.*?)\*', r'\1'),
+    (r'`(.*?)`', r'\1'),
+    (r'\?{2,}', '?'),
+    (r'\n{3,}', '\n\n'),
+    (r'!{3,}', '!'),
+    (r'\.{3,}', '...'),
+    (r'\([0-9:]+ - [0-9:]+\)\s*', ''),
+    (r' {2,}', ' '),
+]
+
+OLD_CLEANING_REPLACES = {
+    '—': '-', '–': '-',
+    'nao': 'não', 'voce': 'você', 'pra': 'para',
+}
+
+
+def _old_clean_text(text):
+    t = text.strip()
+    for pattern, repl in OLD_CLEANING_PATTERNS:
+        t = re.sub(pattern, repl, t)
+    for old, new in OLD_CLEANING_REPLACES.items():
+        t = t.replace(old, new)
+    return t.strip()
+
+
+# Inputs representative of the transcripts, with balanced markup only.
+# Outside this subset the outputs differ, by design or by construction:
+# - unbalanced "*" or "`": the single alternation pairs markup differently than the sequential passes;
+# - curly quotes: now normalized to straight quotes (the old replace was a no-op);
+# - "nao"/"voce"/"pra" inside other words ("prato"): now only whole words are replaced;
+# - texts shorter than MIN_INTERVIEW_CHARS: now cleaned to "".
+REPRESENTATIVE_TEXTS = [
+    "Moderador: (00:01 - 00:15) Boa noite a todos, vamos começar falando sobre cerveja.\n"
+    "Carlos: Eu bebo **Brahma** desde sempre, é a minha favorita!!!",
+    "Ana:   Eu   prefiro   a *Skol*,\tela é mais leve e refrescante...... "
+    "Sério??? Ninguém aqui toma `Stella`?\n\n\n\nModerador: E você?",
+    "(12:30 - 12:45) Pedro: nao sei, voce sabe que eu vou pra casa no fim de semana "
+    "e lá só tem latinha — geralmente Antarctica – às vezes Original.",
+    "Moderador: O que vocês acham da propaganda?\r\n"
+    "Julia: **Muito boa, com *cores* fortes**... e o `slogan` pegou!!!! Gostei demais??",
+    "Texto simples sem marcação nenhuma, só uma frase comprida o suficiente para passar do mínimo.",
+]
+
+
+@pytest.mark.parametrize("text", REPRESENTATIVE_TEXTS)
+def test_matches_old_sequential_pipeline(text):
+    """The single-pass cleaner matches the old sequential re.sub pipeline on balanced markup."""
+    assert len(text.strip()) >= MIN_INTERVIEW_CHARS
+    assert _clean_text(text) == _old_clean_text(text)
+
+
+def test_short_text_is_dropped():
+    """Texts shorter than MIN_INTERVIEW_CHARS are not interviews."""
+    assert _clean_text("  Título  ") == ""
+    assert _clean_text("") == ""
+
+
+def test_word_replaces_only_whole_words():
+    """nao/voce/pra are replaced only as whole words."""
+    text = "Naomi disse que nao vai pra lá, mas vai levar o prato e o vocero para a festa."
+    cleaned = _clean_text(text)
+    assert "não vai para lá" in cleaned
+    assert "Naomi" in cleaned and "prato" in cleaned and "vocero" in cleaned
+
+
+def test_typographic_quotes_are_normalized():
+    """Curly quotes become straight quotes and the replacement character is dropped."""
+    text = "Carlos: “É a melhor”, ela disse ‘sempre’ �no bar com os amigos."
+    assert _clean_text(text) == "Carlos: \"É a melhor\", ela disse 'sempre' no bar com os amigos."
@@ -0,0 +1,108 @@
+import os
+import sys
+
+import orjson
+
+# Ensure src is in path for testing if not installed
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from desk_research.tools import extract_insights_tool as eit
+
+TEXT = (
+    "Moderador: Qual cerveja vocês tomam no fim de semana? "
+    "Carlos: Eu tomo Brahma com os amigos quase todo sábado. "
+    "Ana: Prefiro Skol porque é mais leve no calor."
+)
+
+
+class FakeAsimov:
+    """Asimov client double: records uploaded snippet keys and fails batches containing `fail_keys` once."""
+
+    enabled = True
+    dataset = "ds"
+
+    def __init__(self):
+        self.fail_keys = set()
+        self.uploaded = []
+
+    def is_configured(self):
+        return True
+
+    def ensure_dataset(self):
+        return {"ok": True}
+
+    def upload_snippets(self, snippets, dataset=None):
+        keys = [s["key"] for s in snippets]
+        failing = self.fail_keys.intersection(keys)
+        if failing:
+            self.fail_keys -= failing
+            return {"ok": False, "reason": "boom"}
+        self.uploaded.extend(keys)
+        return {"ok": True}
+
+
+def _setup(tmp_path, monkeypatch):
+    ingest = tmp_path / "ingest"
+    ingest.mkdir()
+    asimov = FakeAsimov()
+    monkeypatch.setattr(eit.AsimovClient, "shared_from_env", classmethod(lambda cls: asimov))
+    # one snippet per batch, so a failure hits only part of the file
+    monkeypatch.setattr(eit, "MAX_ITEMS_PER_BATCH", 1)
+    return ingest, tmp_path / "out", asimov
+
+
+def _write_ingested(ingest, text):
+    (ingest / "g1.json").write_bytes(orjson.dumps({"uuid": "u1", "file_name": "g1.docx", "text": text}))
+
+
+def _run(ingest, out):
+    return eit.ExtractInsightsTool()._run(str(ingest), str(out))
+
+
+def _status(out):
+    return orjson.loads((out / "g1.json").read_bytes())["asimov_insights_upload"]["status"]
+
+
+def test_resume_retries_after_partial_upload_failure(tmp_path, monkeypatch):
+    """A partially failed upload is retried on the next run, sending only the missing snippets."""
+    ingest, out, asimov = _setup(tmp_path, monkeypatch)
+    _write_ingested(ingest, TEXT)
+
+    snippets = eit._format_insights_for_asimov(eit._rules_extract(TEXT), "u1", {"file_name": "g1.docx"})
+    failed_key = snippets[1]["key"]
+    asimov.fail_keys = {failed_key}
+
+    _run(ingest, out)
+    assert _status(out) == "partial"
+    assert failed_key not in asimov.uploaded
+
+    asimov.uploaded.clear()
+    _run(ingest, out)
+    assert _status(out) == "ok"
+    assert failed_key in asimov.uploaded
+    assert snippets[2]["key"] not in asimov.uploaded
+
+    # fully uploaded: the next run does not even reread the file
+    asimov.uploaded.clear()
+    _run(ingest, out)
+    assert asimov.uploaded == []
+
+
+def test_reextracted_file_with_failed_upload_is_retried(tmp_path, monkeypatch):
+    """An upload that succeeded before a re-extraction does not hide a later failure."""
+    ingest, out, asimov = _setup(tmp_path, monkeypatch)
+    _write_ingested(ingest, TEXT)
+    _run(ingest, out)
+    assert _status(out) == "ok"
+
+    changed = TEXT + " Carlos: Depois do jogo sempre peço uma Heineken bem gelada."
+    _write_ingested(ingest, changed)
+    snippets = eit._format_insights_for_asimov(eit._rules_extract(changed), "u1", {"file_name": "g1.docx"})
+    asimov.fail_keys = {s["key"] for s in snippets}
+    _run(ingest, out)
+    assert _status(out) == "error"
+
+    asimov.uploaded.clear()
+    _run(ingest, out)
+    assert _status(out) == "ok"
+    assert snippets[-1]["key"] in asimov.uploaded
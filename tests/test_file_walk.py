@@ -0,0 +1,46 @@
+import os
+import sys
+
+# Ensure src is in path for testing if not installed
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from desk_research.utils.file_walk import iter_files
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("x", encoding="utf-8")
+
+
+def test_filters_by_suffix_case_insensitively(tmp_path):
+    """Only files whose lower-cased extension is in `suffixes` are yielded."""
+    _touch(tmp_path / "a.docx")
+    _touch(tmp_path / "B.DOCX")
+    _touch(tmp_path / "c.doc")
+    _touch(tmp_path / "d.docx.bak")
+    _touch(tmp_path / "docx")
+
+    found = sorted(p.name for p in iter_files(tmp_path, frozenset({".docx"})))
+    assert found == ["B.DOCX", "a.docx"]
+
+
+def test_recurses_into_subdirectories(tmp_path):
+    """Nested directories are walked; directories themselves are never yielded."""
+    _touch(tmp_path / "top.json")
+    _touch(tmp_path / "one" / "mid.json")
+    _touch(tmp_path / "one" / "two" / "deep.json")
+    _touch(tmp_path / "one" / "two" / "skip.txt")
+    (tmp_path / "empty.json").mkdir()
+
+    found = sorted(p.relative_to(tmp_path).as_posix() for p in iter_files(tmp_path, frozenset({".json"})))
+    assert found == ["one/mid.json", "one/two/deep.json", "top.json"]
+
+
+def test_multiple_suffixes(tmp_path):
+    """Any of the given suffixes matches."""
+    _touch(tmp_path / "a.json")
+    _touch(tmp_path / "b.docx")
+    _touch(tmp_path / "c.pdf")
+
+    found = sorted(p.name for p in iter_files(tmp_path, frozenset({".json", ".docx"})))
+    assert found == ["a.json", "b.docx"]
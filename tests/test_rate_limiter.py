@@ -0,0 +1,82 @@
+import os
+import sys
+
+# Ensure src is in path for testing if not installed
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from desk_research.utils import rate_limiter
+from desk_research.utils.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock whose sleep just advances time, so waits are observable without sleeping."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _bucket(monkeypatch, rate, per=60.0):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", clock.sleep)
+    return TokenBucket(rate, per=per), clock
+
+
+def test_disabled_bucket_never_waits(monkeypatch):
+    """rate <= 0 disables the limiter."""
+    bucket, clock = _bucket(monkeypatch, 0)
+    for _ in range(100):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+
+def test_burst_up_to_capacity_without_waiting(monkeypatch):
+    """A fresh bucket allows a burst of `rate` acquisitions."""
+    bucket, clock = _bucket(monkeypatch, 60)
+    for _ in range(60):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+
+def test_waits_for_refill_when_empty(monkeypatch):
+    """Once drained, the next acquisition sleeps exactly until one token has refilled."""
+    bucket, clock = _bucket(monkeypatch, 60)  # 1 token/s
+    for _ in range(60):
+        bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == [1.0]
+
+
+def test_refill_over_elapsed_time(monkeypatch):
+    """Tokens refill with elapsed time, capped at the capacity."""
+    bucket, clock = _bucket(monkeypatch, 60)
+    for _ in range(60):
+        bucket.acquire()
+
+    clock.now += 10  # 10 tokens back
+    for _ in range(10):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+    clock.now += 3600  # refill never exceeds the capacity
+    for _ in range(60):
+        bucket.acquire()
+    assert clock.sleeps == []
+    bucket.acquire()
+    assert clock.sleeps == [1.0]
+
+
+def test_amount_larger_than_capacity_waits_for_full_bucket(monkeypatch):
+    """Requests larger than the capacity are clamped and wait for a full bucket."""
+    bucket, clock = _bucket(monkeypatch, 10, per=10.0)  # 1 token/s, capacity 10
+    bucket.acquire(10)
+    bucket.acquire(50)
+    assert clock.sleeps == [10.0]
@@ -0,0 +1,57 @@
+import os
+import sys
+
+# Ensure src is in path for testing if not installed
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from desk_research.tools.extract_insights_tool import _rules_extract
+
+TRANSCRIPT = (
+    "Teste (May 21, 2025 - 9:20pm) "
+    "Moderador: Boa noite, qual cerveja vocês costumam tomar? "
+    "Carlos: Eu tomo brahma desde sempre, e às vezes uma Skol no calor. "
+    "Ana Souza: Prefiro Stella Artois, acho bem mais leve que a Brahma. "
+    "Moderador: E no fim de semana? "
+    "Carlos: Sim. "
+    "Ana Souza: No fim de semana vai Heineken com os amigos, sem dúvida."
+)
+
+
+def test_moderator_turns_become_questions():
+    """The first speaker is the moderator; each answer carries the latest moderator turn."""
+    citacoes = _rules_extract(TRANSCRIPT)["citacoes"]
+
+    assert [c["quota"]["nome"] for c in citacoes] == ["Carlos", "Ana Souza", "Ana Souza"]
+    assert citacoes[0]["pergunta"] == "Boa noite, qual cerveja vocês costumam tomar?"
+    assert citacoes[1]["pergunta"] == "Boa noite, qual cerveja vocês costumam tomar?"
+    assert citacoes[2]["pergunta"] == "E no fim de semana?"
+    assert citacoes[0]["citacao"] == "Eu tomo brahma desde sempre, e às vezes uma Skol no calor."
+
+
+def test_short_answers_are_skipped():
+    """Answers with fewer than three words ("Sim.") are not citations."""
+    citacoes = _rules_extract(TRANSCRIPT)["citacoes"]
+    assert all(c["citacao"] != "Sim." for c in citacoes)
+
+
+def test_brands_are_canonical_and_deduplicated():
+    """Brand mentions are matched case-insensitively, canonicalized and kept in order of appearance."""
+    citacoes = _rules_extract(TRANSCRIPT)["citacoes"]
+
+    assert citacoes[0]["marcaMencionada"] == ["Brahma", "Skol"]
+    assert citacoes[1]["marcaMencionada"] == ["Stella Artois", "Brahma"]
+    assert citacoes[2]["marcaMencionada"] == ["Heineken"]
+
+
+def test_interview_date_and_default_quota():
+    """The date comes from the '(Month D, YYYY - H:MMpm)' stamp; other quota fields are unknown."""
+    citacao = _rules_extract(TRANSCRIPT)["citacoes"][0]
+
+    assert citacao["dataEntrevista"] == "2025-05-21"
+    assert citacao["quota"]["idade"] == "Não informado"
+    assert citacao["insight"] == ""
+
+
+def test_without_speaker_turns():
+    """Text without speaker turns yields no citations."""
+    assert _rules_extract("Transcrição sem identificação de falantes.") == {"citacoes": []}